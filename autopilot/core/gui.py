@@ -50,6 +50,7 @@ from autopilot.core import styles
 from autopilot.core.plots import Video
 from autopilot.core.loggers import init_logger
 from autopilot.utils import plugins, registry, wiki
+from autopilot.utils.common import save_pilotdb, list_protocols
 
 _MAPS = {
     'dialog': {
@@ -71,6 +72,11 @@ Maps of shorthand names for objects to the objects themselves.
 Grouped by a rough use case, intended for internal (rather than user-facing) use.
 """
 
+_ZERO_MARGINS = QtCore.QMargins(0, 0, 0, 0)
+"""
+Shared empty margins for layouts, so each panel doesn't construct its own
+"""
+
 
 def gui_event(fn):
     """
@@ -125,6 +131,11 @@ class Control_Panel(QtWidgets.QWidget):
     # Hosts two nested tab widgets to select pilot and subject,
     # set params, run subjects, etc.
 
+    DB_FLUSH_DELAY = 500
+    """
+    Time (ms) to wait after a call to :meth:`.update_db` before writing the pilot db
+    """
+
     def __init__(self, subjects, start_fn, ping_fn, pilots):
         """
 
@@ -146,9 +157,20 @@ class Control_Panel(QtWidgets.QWidget):
         self.subject_lists = {}
         self.panels = {}
 
+        # writes to the pilot db are coalesced, see update_db
+        self._db_dirty = False
+        self._flush_pending = False
+
+        # threads creating new subjects, see create_subject
+        self._subject_threads = []
+
+        app = QtWidgets.QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._about_to_quit)
+
         # Set layout for whole widget
         self.layout = QtWidgets.QGridLayout()
-        self.layout.setContentsMargins(0,0,0,0)
+        self.layout.setContentsMargins(_ZERO_MARGINS)
         self.layout.setSpacing(0)
         self.setLayout(self.layout)
 
@@ -170,8 +192,15 @@ class Control_Panel(QtWidgets.QWidget):
         self.layout.setColumnStretch(0, 2)
         self.layout.setColumnStretch(1, 2)
 
-        for pilot_id, pilot_params in self.pilots.items():
-            self.add_pilot(pilot_id, pilot_params.get('subjects', []))
+        # we're already in the GUI thread, so add pilots directly rather than
+        # posting an event for each, and only lay out & repaint once at the end
+        add_pilot = self._add_pilot
+        self.setUpdatesEnabled(False)
+        try:
+            for pilot_id, pilot_params in self.pilots.items():
+                add_pilot(pilot_id, pilot_params.get('subjects', []))
+        finally:
+            self.setUpdatesEnabled(True)
 
     @gui_event
     def add_pilot(self, pilot_id:str, subjects:typing.Optional[list]=None):
@@ -182,9 +211,21 @@ class Control_Panel(QtWidgets.QWidget):
          subjects (list): Optional, list of any subjects that the pilot has.
         Returns:
         """
+        self._add_pilot(pilot_id, subjects)
+
+    def _add_pilot(self, pilot_id:str, subjects:typing.Optional[list]=None):
         if subjects is None:
             subjects = []
 
+        # if we already have widgets for this pilot, just repopulate its list
+        # rather than stacking a duplicate row into the layout
+        if pilot_id in self.subject_lists:
+            subject_list = self.subject_lists[pilot_id]
+            subject_list.clear()
+            subject_list.subjects = list(subjects)
+            subject_list.populate_list()
+            return
+
         # Make a list of subjects
         subject_list = Subject_List(subjects, drop_fn=self.update_db)
         subject_list.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
@@ -221,29 +262,72 @@ class Control_Panel(QtWidgets.QWidget):
             # TODO: Make a "session" history table that stashes pilot, git hash, step, etc. for each session - subjects might run on different pilots
             biography_vals['pilot'] = pilot
 
-            # Make a new subject object, make it temporary because we want to close it
-            subject_obj = Subject(biography_vals['id'], new=True,
-                                biography=biography_vals)
-            self.subjects[biography_vals['id']] = subject_obj
-
-            # If a protocol was selected in the subject wizard, assign it.
+            # if the wizard couldn't find the protocol dir, no task tab was made
             try:
                 protocol_vals = new_subject_wizard.task_tab.values
-                if 'protocol' in protocol_vals.keys() and 'step' in protocol_vals.keys():
-                    protocol_file = os.path.join(prefs.get('PROTOCOLDIR'), protocol_vals['protocol'] + '.json')
-                    subject_obj.assign_protocol(protocol_file, int(protocol_vals['step']))
-                    self.logger.debug(f'assigned protocol with {protocol_vals}')
-                else:
-                    self.logger.warning(f'protocol couldnt be assigned, no step and protocol keys in protocol_vals.\ngot protocol_vals: {protocol_vals}')
             except Exception as e:
-                self.logger.exception(f'exception when assigning protocol, continuing subject creation. \n{e}')
-                # the wizard couldn't find the protocol dir, so no task tab was made
-                # or no task was assigned
+                self.logger.exception(f'exception getting protocol from subject wizard, continuing subject creation. \n{e}')
+                protocol_vals = {}
+
+            # making the subject file can take a while, so do it outside the GUI thread.
+            # not a daemon so the file isn't left half-written on exit, see _about_to_quit
+            subject_thread = threading.Thread(target=self._make_subject,
+                                              args=(pilot, biography_vals, protocol_vals))
+            self._subject_threads = [t for t in self._subject_threads if t.is_alive()]
+            self._subject_threads.append(subject_thread)
+            subject_thread.start()
+
+    def _make_subject(self, pilot:str, biography_vals:dict, protocol_vals:dict):
+        """
+        Create the :class:`.Subject` and assign its protocol for :meth:`.create_subject` ,
+        called in a separate thread. Adds the subject to the panel with :meth:`._add_subject` when done.
+        """
+        try:
+            subject_obj = Subject(biography_vals['id'], new=True,
+                                biography=biography_vals)
+        except Exception as e:
+            self.logger.exception(f'exception creating subject {biography_vals["id"]}, not adding it. \n{e}')
+            self._subject_error(f'Subject {biography_vals["id"]} could not be created', str(e))
+            return
+        self.subjects[biography_vals['id']] = subject_obj
+
+        # If a protocol was selected in the subject wizard, assign it.
+        try:
+            if 'protocol' in protocol_vals and 'step' in protocol_vals:
+                protocol_file = os.path.join(prefs.get('PROTOCOLDIR'), protocol_vals['protocol'] + '.json')
+                subject_obj.assign_protocol(protocol_file, int(protocol_vals['step']))
+                self.logger.debug(f'assigned protocol with {protocol_vals}')
+            else:
+                self.logger.warning(f'protocol couldnt be assigned, no step and protocol keys in protocol_vals.\ngot protocol_vals: {protocol_vals}')
+        except Exception as e:
+            self.logger.exception(f'exception when assigning protocol, continuing subject creation. \n{e}')
+            self._subject_error(f'Subject {biography_vals["id"]} was created, but its protocol could not be assigned', str(e))
+
+        self._add_subject(pilot, biography_vals['id'])
+
+    @gui_event
+    def _subject_error(self, message:str, details:str):
+        # the wizard has already closed by the time _make_subject fails, so tell the user
+        box = pop_dialog(message, details, msg_type='error')
+        box.exec_()
+
+    @gui_event
+    def _add_subject(self, pilot:str, subject_id:str):
+        # Add subject to pilots dict, update it and our tabs
+        self.pilots[pilot]['subjects'].append(subject_id)
+        self.subject_lists[pilot].addItem(subject_id)
+        self.update_db()
 
-            # Add subject to pilots dict, update it and our tabs
-            self.pilots[pilot]['subjects'].append(biography_vals['id'])
-            self.subject_lists[pilot].addItem(biography_vals['id'])
-            self.update_db()
+    def _about_to_quit(self):
+        """
+        Before the application quits, finish creating any subjects and write any pending changes to the pilot db
+        """
+        for subject_thread in self._subject_threads:
+            subject_thread.join()
+        self._subject_threads = []
+        # handle the _add_subject events posted by the subject threads
+        QtCore.QCoreApplication.processEvents()
+        self._flush_db()
 
     # TODO: fix this
     # def edit_params(self, item):
@@ -277,10 +361,14 @@ class Control_Panel(QtWidgets.QWidget):
     #
     #
 
-    def update_db(self, pilots:typing.Optional[dict]=None, **kwargs):
+    def update_db(self, **kwargs):
         """
         Gathers any changes in :class:`Subject_List` s and dumps :py:attr:`.pilots` to :py:attr:`.prefs.get('PILOT_DB')`
 
+        The write itself is deferred by :attr:`.DB_FLUSH_DELAY` ms (see :meth:`._flush_db`)
+        so that bursts of changes -- eg. a handshake from every pilot on startup --
+        only rewrite the file once. Pending changes are flushed when the application quits.
+
         Args:
             kwargs: Create new pilots by passing a dictionary with the structure
 
@@ -290,28 +378,43 @@ class Control_Panel(QtWidgets.QWidget):
                 or any other information included in the pilot db
         """
         # if we were given a new pilot, add it
-        if 'new' in kwargs.keys():
+        if 'new' in kwargs:
             for pilot, value in kwargs['new'].items():
                 self.pilots[pilot] = value
 
-        if pilots is None:
-            pilots = self.pilots.copy()
+        self._db_dirty = True
+        if not self._flush_pending:
+            self._flush_pending = True
+            self._schedule_flush()
 
-        # gather subjects from lists
-        for pilot, mlist in self.subject_lists.items():
-            subjects = []
-            for i in range(mlist.count()):
-                subjects.append(mlist.item(i).text())
+    @gui_event
+    def _schedule_flush(self):
+        # timers have to be started from the GUI thread, and update_db can be
+        # called from the networking thread (eg. Terminal.l_handshake)
+        QtCore.QTimer.singleShot(self.DB_FLUSH_DELAY, self._flush_db)
 
-            pilots[pilot]['subjects'] = subjects
+    def _flush_db(self):
+        """
+        Write :py:attr:`.pilots` to disk if :meth:`.update_db` has been called since the last write.
+        """
+        # take and clear the pending change before allowing another flush to be scheduled,
+        # so an update_db from another thread in the meantime gets a flush of its own
+        db_dirty, self._db_dirty = self._db_dirty, False
+        self._flush_pending = False
+        if not db_dirty:
+            return
+
+        # gather subjects from lists
+        for pilot, val in self.pilots.items():
+            mlist = self.subject_lists.get(pilot)
+            if mlist is not None:
+                val['subjects'] = [mlist.item(i).text() for i in range(mlist.count())]
 
         # strip any state that's been stored
-        for p, val in pilots.items():
-            if 'state' in val.keys():
-                del val['state']
+        for val in self.pilots.values():
+            val.pop('state', None)
 
-        with open(prefs.get('PILOT_DB'), 'w') as pilot_file:
-            json.dump(self.pilots, pilot_file, indent=4, separators=(',', ': '))
+        save_pilotdb(self.pilots, prefs.get('PILOT_DB'))
 
 ####################################
 # Control Panel Widgets
@@ -356,8 +459,7 @@ class Subject_List(QtWidgets.QListWidget):
         """
         Adds each item in :py:attr:`Subject_List.subjects` to the list.
         """
-        for m in self.subjects:
-            self.addItem(m)
+        self.addItems(self.subjects)
 
     def dropEvent(self, event):
         """
@@ -401,7 +503,7 @@ class Pilot_Panel(QtWidgets.QWidget):
         super(Pilot_Panel, self).__init__()
 
         self.layout = QtWidgets.QGridLayout()
-        self.layout.setContentsMargins(0,0,0,0)
+        self.layout.setContentsMargins(_ZERO_MARGINS)
         self.layout.setSpacing(0)
         self.setLayout(self.layout)
 
@@ -802,8 +904,7 @@ class New_Subject_Wizard(QtWidgets.QDialog):
             topLabel = QtWidgets.QLabel("Protocols:")
 
             # List available protocols
-            protocol_list = os.listdir(self.protocol_dir)
-            protocol_list = [os.path.splitext(p)[0] for p in protocol_list]
+            protocol_list = list_protocols(self.protocol_dir)
 
             self.protocol_listbox = QtWidgets.QListWidget()
             self.protocol_listbox.insertItems(0, protocol_list)
@@ -2477,7 +2578,9 @@ class Reassign(QtWidgets.QDialog):
                 # set to blank
                 protocol_box.setCurrentIndex(protocol_box.count()-1)
 
-            protocol_box.currentIndexChanged.connect(self.set_protocol)
+            # bind the subject to the slot rather than looking it up from self.sender()
+            protocol_box.currentIndexChanged.connect(
+                lambda index, subject=subject_name: self.set_protocol(subject))
 
             # create & populate step box
             step_box = self.subject_objects[subject][1]
@@ -2487,7 +2590,8 @@ class Reassign(QtWidgets.QDialog):
 
             if step:
                 step_box.setCurrentIndex(step)
-            step_box.currentIndexChanged.connect(self.set_step)
+            step_box.currentIndexChanged.connect(
+                lambda index, subject=subject_name: self.set_step(subject))
 
             # add to layout
             self.grid.addWidget(subject_lab, i%25, 0+(np.floor(i/25))*3)
@@ -2544,15 +2648,16 @@ class Reassign(QtWidgets.QDialog):
 
 
 
-    def set_protocol(self):
+    def set_protocol(self, subject:typing.Optional[str]=None):
         """
         When the protocol is changed, stash that and call :py:meth:`.Reassign.populate_steps` .
-        Returns:
 
+        Args:
+            subject (str): subject whose protocol changed. If None, use the name of the sending combobox
         """
-        subject = self.sender().objectName()
+        if subject is None:
+            subject = self.sender().objectName()
         protocol_box = self.subject_objects[subject][0]
-        step_box = self.subject_objects[subject][1]
 
         self.subjects[subject][0] = protocol_box.currentText()
         self.subjects[subject][1] = 0
@@ -2560,12 +2665,15 @@ class Reassign(QtWidgets.QDialog):
         self.populate_steps(subject)
 
 
-    def set_step(self):
+    def set_step(self, subject:typing.Optional[str]=None):
         """
         When the step is changed, stash that.
+
+        Args:
+            subject (str): subject whose step changed. If None, use the name of the sending combobox
         """
-        subject = self.sender().objectName()
-        protocol_box = self.subject_objects[subject][0]
+        if subject is None:
+            subject = self.sender().objectName()
         step_box = self.subject_objects[subject][1]
 
         self.subjects[subject][1] = step_box.currentIndex()
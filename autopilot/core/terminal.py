@@ -12,7 +12,6 @@ import time
 import datetime
 import logging
 import threading
-from collections import OrderedDict as odict
 import numpy as np
 
 from PySide2 import QtCore, QtGui, QtSvg, QtWidgets
@@ -47,6 +46,7 @@ from autopilot.networking import Net_Node, Terminal_Station
 from autopilot.utils.invoker import get_invoker
 from autopilot.core.gui import Control_Panel, Protocol_Wizard, Weights, Reassign, Calibrate_Water, Bandwidth_Test, pop_dialog, Stream_Video, Plugins
 from autopilot.core.loggers import init_logger
+from autopilot.utils.common import load_pilotdb, save_pilotdb, list_protocols
 
 # Try to import viz, but continue if that doesn't work
 IMPORTED_VIZ = False
@@ -403,7 +403,7 @@ class Terminal(QtWidgets.QMainWindow):
     # Properties
 
     @property
-    def pilots(self) -> odict:
+    def pilots(self) -> dict:
         """
         A dictionary mapping pilot ID to its attributes, including a list of its subjects assigned to it, its IP, etc.
 
@@ -419,16 +419,14 @@ class Terminal(QtWidgets.QMainWindow):
             # if pilot file doesn't exist, make blank one
             if not pilot_db_fn.exists():
                 self.logger.warning(f'No pilot_db.json file was found at {pilot_db_fn}, creating a new one')
-                self._pilots = odict()
-                with open(pilot_db_fn, 'w') as pilot_file:
-                    json.dump(self._pilots, pilot_file)
+                self._pilots = {}
+                save_pilotdb(self._pilots, pilot_db_fn)
 
             # otherwise, try to load it
             else:
                 try:
-                    # Load pilots db as ordered dictionary
-                    with open(pilot_db_fn, 'r') as pilot_file:
-                        self._pilots = json.load(pilot_file, object_pairs_hook=odict)
+                    # Load pilots db, dicts keep the order of pilots in the file
+                    self._pilots = load_pilotdb(pilot_db_fn)
                     self.logger.info(f'successfully loaded pilot_db.json file from {pilot_db_fn}')
                     self.logger.debug(pformat(self._pilots))
                 except Exception as e:
@@ -447,10 +445,7 @@ class Terminal(QtWidgets.QMainWindow):
         Returns:
             list: list of protocol names in ``prefs.get('PROTOCOLDIR')``
         """
-        # get list of protocol files
-        protocols = os.listdir(prefs.get('PROTOCOLDIR'))
-        protocols = [os.path.splitext(p)[0] for p in protocols if p.endswith('.json')]
-        return protocols
+        return list_protocols(prefs.get('PROTOCOLDIR'))
 
     @property
     def subject_protocols(self) -> dict:
@@ -463,7 +458,7 @@ class Terminal(QtWidgets.QMainWindow):
         subjects = self.subject_list
         subjects_protocols = {}
         for subject in subjects:
-            if subject not in self.subjects.keys():
+            if subject not in self.subjects:
                 self.subjects[subject] = Subject(subject)
 
             subjects_protocols[subject] = [self.subjects[subject].protocol_name, self.subjects[subject].step]
@@ -531,7 +526,7 @@ class Terminal(QtWidgets.QMainWindow):
                                                             "Starting Weight:")
             if ok:
                 # Ope'nr up if she aint
-                if subject not in self.subjects.keys():
+                if subject not in self.subjects:
                     self.subjects[subject] = Subject(subject)
 
                 task = self.subjects[subject].prepare_run()
@@ -635,7 +630,7 @@ class Terminal(QtWidgets.QMainWindow):
 
         # update the pilot button
         self.logger.debug(f'updating pilot state: {value}')
-        if value['pilot'] not in self.pilots.keys():
+        if value['pilot'] not in self.pilots:
             self.logger.info('Got state info from an unknown pilot, adding...')
             self.new_pilot(name=value['pilot'])
 
@@ -652,10 +647,11 @@ class Terminal(QtWidgets.QMainWindow):
         Args:
             value (dict): dict containing `ip` and `state`
         """
-        if value['pilot'] in self.pilots.keys():
-            self.pilots[value['pilot']]['ip'] = value.get('ip', '')
-            self.pilots[value['pilot']]['state'] = value.get('state', '')
-            self.pilots[value['pilot']]['prefs'] = value.get('prefs', {})
+        pilot = self.pilots.get(value['pilot'])
+        if pilot is not None:
+            pilot['ip'] = value.get('ip', '')
+            pilot['state'] = value.get('state', '')
+            pilot['prefs'] = value.get('prefs', {})
 
         else:
             self.new_pilot(name=value['pilot'],
@@ -663,8 +659,9 @@ class Terminal(QtWidgets.QMainWindow):
                            pilot_prefs=value.get('prefs', {}))
 
         # update the pilot button
-        if value['pilot'] in self.control_panel.panels.keys():
-            self.control_panel.panels[value['pilot']].button.set_state(value['state'])
+        panel = self.control_panel.panels.get(value['pilot'])
+        if panel is not None:
+            panel.button.set_state(value['state'])
 
 
         self.control_panel.update_db()
@@ -691,7 +688,7 @@ class Terminal(QtWidgets.QMainWindow):
                 return
 
         # Warn if we're going to overwrite
-        if name in self.pilots.keys():
+        if name in self.pilots:
             self.logger.warning(f'pilot with id {name} already in pilot db, overwriting...')
 
         if pilot_prefs is None:
@@ -719,7 +716,7 @@ class Terminal(QtWidgets.QMainWindow):
             for s in steps:
                 param_values = {}
                 for k, v in s.items():
-                    if 'value' in v.keys():
+                    if 'value' in v:
                         param_values[k] = v['value']
                     elif k == 'stim':
                         # TODO: Super hacky - don't do this. Refactor params already.
@@ -749,7 +746,7 @@ class Terminal(QtWidgets.QMainWindow):
 
         # open objects if not already
         for subject in subjects:
-            if subject not in self.subjects.keys():
+            if subject not in self.subjects:
                 self.subjects[subject] = Subject(subject)
 
         # for each subject, get weight
@@ -768,13 +765,12 @@ class Terminal(QtWidgets.QMainWindow):
         """
         #
         # get list of protocol files
-        protocols = os.listdir(prefs.get('PROTOCOLDIR'))
-        protocols = [p for p in protocols if p.endswith('.json')]
+        protocols = [p + '.json' for p in self.protocols]
 
         updated_subjects = []
         subjects = self.subject_list
         for subject in subjects:
-            if subject not in self.subjects.keys():
+            if subject not in self.subjects:
                 self.subjects[subject] = Subject(subject)
 
             protocol_bool = [self.subjects[subject].protocol_name == os.path.splitext(p)[0] for p in protocols]
@@ -6,11 +6,16 @@ import atexit
 from time import sleep
 import threading
 import shutil
+import shlex
 import signal
+import socket
+import typing
 
 PIGPIO = False
 PIGPIO_DAEMON = None
 PIGPIO_LOCK = threading.Lock()
+PIGPIO_PIDFILE = '/var/run/pigpio.pid'
+PIGPIO_PORT = 8888
 try:
     if shutil.which('pigpiod') is not None:
         PIGPIO = True
@@ -18,48 +23,73 @@ try:
 except ImportError:
     pass
 
-JACKD = False
+JACKD = None
+"""
+Whether the jack client library could be imported. ``None`` until checked with :func:`._detect_jackd` ,
+which is deferred until needed so that importing autopilot doesn't load libjack.
+"""
 # JACKD_MODULE = None # Whether jackd is a module in autopilot.external (True) or use system jackd (False)
 JACKD_PROCESS = None
-try:
-    import jack
-    JACKD = True
-    # from autopilot.external import jack as autopilot_jack
-    #
-    # # set env variables
-    # jackd_path = os.path.join(autopilot_jack.__path__._path[0])
-    #
-    # # specify location of libraries when starting jackd
-    #
-    #
-    # if 'LD_LIBRARY_PATH' in os.environ.keys():
-    #
-    #     os.environ['LD_LIBRARY_PATH'] = ":".join([os.path.join(jackd_path, 'lib'),
-    #                                               os.environ.get('LD_LIBRARY_PATH',"")])
-    # else:
-    #     os.environ['LD_LIBRARY_PATH'] = os.path.join(jackd_path, 'lib')git pu
-    # # lib_string = "LD_LIBRARY_PATH=" + os.path.join(jackd_path, 'lib')
-    #
-    # # specify location of drivers when starting jackd
-    # os.environ['JACK_DRIVER_DIR'] = os.path.join(jackd_path, 'lib', 'jack')
-    # # driver_string = "JACK_DRIVER_DIR=" + os.path.join(jackd_path, 'lib', 'jack')
-    #
-    # JACKD = True
-    # JACKD_MODULE = True
 
-except (ImportError, OSError):
-    pass
-    # # try to import jack client, it will look for system jack by default
-    # try:
-    #     import jack
-    #     JACKD = True
-    #     JACKD_MODULE = False
-    # except OSError:
-    #     # no need to do anything, just setting module variables that test what the system is configured to do
-    #     pass
+
+def _detect_jackd() -> bool:
+    """
+    Check whether the jack client library can be imported, caching the result in :data:`.JACKD`
+
+    Returns:
+        bool
+    """
+    if globals()['JACKD'] is None:
+        try:
+            import jack
+            globals()['JACKD'] = True
+            # from autopilot.external import jack as autopilot_jack
+            #
+            # # set env variables
+            # jackd_path = os.path.join(autopilot_jack.__path__._path[0])
+            #
+            # # specify location of libraries when starting jackd
+            #
+            #
+            # if 'LD_LIBRARY_PATH' in os.environ.keys():
+            #
+            #     os.environ['LD_LIBRARY_PATH'] = ":".join([os.path.join(jackd_path, 'lib'),
+            #                                               os.environ.get('LD_LIBRARY_PATH',"")])
+            # else:
+            #     os.environ['LD_LIBRARY_PATH'] = os.path.join(jackd_path, 'lib')git pu
+            # # lib_string = "LD_LIBRARY_PATH=" + os.path.join(jackd_path, 'lib')
+            #
+            # # specify location of drivers when starting jackd
+            # os.environ['JACK_DRIVER_DIR'] = os.path.join(jackd_path, 'lib', 'jack')
+            # # driver_string = "JACK_DRIVER_DIR=" + os.path.join(jackd_path, 'lib', 'jack')
+            #
+            # JACKD = True
+            # JACKD_MODULE = True
+        except (ImportError, OSError):
+            globals()['JACKD'] = False
+            # # try to import jack client, it will look for system jack by default
+            # try:
+            #     import jack
+            #     JACKD = True
+            #     JACKD_MODULE = False
+            # except OSError:
+            #     # no need to do anything, just setting module variables that test what the system is configured to do
+            #     pass
+
+    return globals()['JACKD']
 
 
 def start_pigpiod():
+    """
+    Start the pigpio daemon, if it isn't already running.
+
+    If a pigpiod that we didn't launch is already running (according to its pid file),
+    don't try to launch another one, which would fail to acquire pigpio's lock.
+
+    Returns:
+        :class:`subprocess.Popen` of the launched daemon, or the ``int`` pid of a
+        daemon that was already running.
+    """
     if not PIGPIO:
         raise ImportError('the pigpiod daemon was not found! use autopilot.setup.')
 
@@ -67,36 +97,90 @@ def start_pigpiod():
         if globals()['PIGPIO_DAEMON'] is not None:
             return globals()['PIGPIO_DAEMON']
 
+        running_pid = _running_pigpiod()
+        if running_pid is not None:
+            globals()['PIGPIO_DAEMON'] = running_pid
+            return running_pid
+
         launch_pigpiod = shutil.which('pigpiod')
         if launch_pigpiod is None:
             raise RuntimeError('the pigpiod binary was not found!')
 
+        launch_args = ['sudo', launch_pigpiod]
         if prefs.get( 'PIGPIOARGS'):
-            launch_pigpiod += ' ' + prefs.get('PIGPIOARGS')
+            launch_args.extend(shlex.split(prefs.get('PIGPIOARGS')))
 
         if prefs.get( 'PIGPIOMASK'):
             # if it's been converted to an integer, convert back to a string and zfill any leading zeros that were lost
             if isinstance(prefs.get('PIGPIOMASK'), int):
                 prefs.set('PIGPIOMASK', str(prefs.get('PIGPIOMASK')).zfill(28))
-            launch_pigpiod += ' -x ' + prefs.get('PIGPIOMASK')
+            launch_args.extend(['-x', prefs.get('PIGPIOMASK')])
 
-        proc = subprocess.Popen('sudo ' + launch_pigpiod, shell=True)
+        proc = subprocess.Popen(launch_args)
         globals()['PIGPIO_DAEMON'] = proc
 
-        # kill process when session ends
-        def kill_proc(*args):
-            proc.kill()
-            sys.exit(1)
-        atexit.register(kill_proc)
-        signal.signal(signal.SIGTERM, kill_proc)
+        # stop the daemon when session ends -- proc is just the sudo launcher,
+        # which exits once pigpiod has forked into the background
+        _stop_at_exit(proc, _shutdown_pigpiod)
 
-        # sleep to let it boot up
-        sleep(1)
+        # wait until it's accepting connections, rather than a fixed sleep
+        _wait_for_pigpiod(proc, _pigpiod_port(launch_args))
 
         return proc
 
+
+def _running_pigpiod():
+    """
+    Check for an already-running pigpiod from its pid file
+
+    Returns:
+        int: the pid of the running daemon, or None if it isn't running
+    """
+    try:
+        with open(PIGPIO_PIDFILE, 'r') as pidfile:
+            pid = int(pidfile.read().strip())
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        # stale pid file
+        return None
+    except PermissionError:
+        # exists, but is owned by root since we launch it with sudo
+        pass
+    return pid
+
+
+def _pigpiod_port(launch_args:list) -> int:
+    """
+    Get the port pigpiod will listen on from its ``-p`` launch argument, or the default port
+    """
+    try:
+        return int(launch_args[launch_args.index('-p') + 1])
+    except (ValueError, IndexError):
+        return PIGPIO_PORT
+
+
+def _wait_for_pigpiod(proc:subprocess.Popen, port:int, timeout:float=1):
+    """
+    Poll pigpiod's socket until it accepts connections, the process fails, or ``timeout`` seconds pass.
+
+    pigpiod forks itself into the background, so the launching process exiting cleanly
+    doesn't mean the daemon is ready (or has failed).
+    """
+    for _ in range(int(timeout/0.01)):
+        if proc.poll() not in (None, 0):
+            return
+        try:
+            socket.create_connection(('localhost', port), timeout=0.05).close()
+            return
+        except OSError:
+            sleep(0.01)
+
 def start_jackd():
-    if not JACKD:
+    if not _detect_jackd():
         raise ImportError('jackd was not found in autopilot.external or as a system install')
 
     # get specific launch string from prefs
@@ -139,15 +223,62 @@ def start_jackd():
     proc = subprocess.Popen(launch_jackd, shell=True)
     globals()['JACKD_PROCESS'] = proc
 
-    # kill process when session ends
-    def kill_proc(*args):
-        proc.kill()
-        sys.exit(1)
-    atexit.register(kill_proc)
-    signal.signal(signal.SIGTERM, kill_proc)
+    # stop process when session ends
+    _stop_at_exit(proc)
 
     # sleep to let it boot
     sleep(2)
 
     return proc
 
+
+def _stop_at_exit(proc:subprocess.Popen, shutdown:typing.Optional[typing.Callable[[subprocess.Popen], None]]=None):
+    """
+    Stop ``proc`` with ``shutdown`` (default :func:`._shutdown` ) when the session ends.
+
+    ``atexit`` handlers don't run when the process is killed with SIGTERM,
+    so SIGTERM is turned into a normal exit (which does run them).
+    """
+    if shutdown is None:
+        shutdown = _shutdown
+    atexit.register(shutdown, proc)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+def _shutdown(proc:subprocess.Popen, timeout:float=2):
+    """
+    Ask ``proc`` to terminate so it can clean up after itself, killing it if it
+    hasn't exited after ``timeout`` seconds, and reap it so it doesn't linger as a zombie.
+    """
+    if proc.poll() is not None:
+        return
+    try:
+        proc.terminate()
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _shutdown_pigpiod(proc:subprocess.Popen, timeout:float=2):
+    """
+    Stop the pigpiod that ``proc`` launched.
+
+    pigpiod daemonizes, so rather than ``proc`` we signal the pid in its pid file (with sudo,
+    since it runs as root) so it can clean up, killing it if it hasn't exited after ``timeout`` seconds.
+    """
+    _shutdown(proc, timeout)
+
+    pid = _running_pigpiod()
+    if pid is None:
+        return
+    subprocess.run(['sudo', 'kill', '-TERM', str(pid)])
+    for _ in range(int(timeout/0.05)):
+        if _running_pigpiod() is None:
+            return
+        sleep(0.05)
+    subprocess.run(['sudo', 'kill', '-KILL', str(pid)])
+
+
+def _exit_on_sigterm(*args):
+    sys.exit(1)
@@ -149,7 +149,8 @@ class GPIO(Hardware):
     Attributes:
         pig (:class:`pigpio.pi`): An object that manages connection to the pigpio daemon. See docs at http://abyz.me.uk/rpi/pigpio/python.html
         CONNECTED (bool): Whether the connection to pigpio was successful
-        pigpiod: Reference to the pigpiod process launched by :func:`.external.start_pigpiod`
+        pigpiod (:class:`subprocess.Popen`, int): Return value of :func:`.external.start_pigpiod` -- the Popen of the
+            daemon it launched, or the ``int`` pid of a pigpiod that was already running.
         pin (int): The `Board-numbered <https://raspberrypi.stackexchange.com/a/12967>`_ GPIO pin of this object.
         pin_bcm (int): The BCM number of the connected pin -- used by pigpio. Converted from pin passed as argument on initialization,
             which is assumed to be the board number.
@@ -473,7 +473,7 @@ class I2C_9DOF(Hardware):
         Uses :class:`.transform.geometry.IMU_Orientation` to fuse accelerometer and gyroscope with Kalman filter
 
         Returns:
-            np.ndarray - [roll, pitch]
+            np.ndarray - [roll, pitch], a new array on each read
         """
 
         # read gyro and accelerometer together
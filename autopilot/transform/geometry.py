@@ -1,14 +1,21 @@
 import typing
-from time import time
+import math
+from functools import lru_cache
+from time import monotonic_ns
 
 import numpy as np
 from scipy.spatial import distance
-from scipy.spatial.transform import Rotation as R
 from scipy.optimize import curve_fit
 
 from autopilot.transform.transforms import Transform
 from autopilot.transform.timeseries import Kalman
 
+try:
+    from numba import njit
+    NUMBA = True
+except ImportError:
+    NUMBA = False
+
 
 class Distance(Transform):
     """
@@ -41,12 +48,24 @@ class Distance(Transform):
         self.metric = metric
         self.squareform = squareform
 
+        # reusable condensed distance buffer for outputs that are reduced or copied
+        self._pdist_out = None # type: typing.Optional[np.ndarray]
+
     def process(self, input: np.ndarray):
 
-        # filter to input_dimension
-        input = input[:,0:self.n_dim]
+        # filter to input_dimension, only slicing (and copying, since
+        # column slices aren't contiguous) if we actually need to
+        if input.shape[1] > self.n_dim:
+            input = np.ascontiguousarray(input[:,0:self.n_dim])
 
-        output = distance.pdist(input, metric=self.metric)
+        if self.pairwise and not self.squareform:
+            # condensed matrix is returned directly, so it can't share a buffer
+            output = distance.pdist(input, metric=self.metric)
+        else:
+            n_pairs = (input.shape[0] * (input.shape[0] - 1)) // 2
+            if self._pdist_out is None or self._pdist_out.shape[0] != n_pairs:
+                self._pdist_out = np.empty((n_pairs,), dtype=np.double)
+            output = distance.pdist(input, metric=self.metric, out=self._pdist_out)
 
         if self.pairwise:
             if self.squareform:
@@ -65,18 +84,37 @@ class Angle(Transform):
     format_in = {'type': np.ndarray}
     format_out = {'type': float}
 
+    _RAD2DEG = 180.0/np.pi
+
     def __init__(self, abs=True, degrees=True, *args, **kwargs):
         super(Angle, self).__init__(*args, **kwargs)
         self.abs = abs
         self.degrees = degrees
 
+        # fold the offset and unit conversion into a single multiply-add
+        self._scale = self._RAD2DEG if self.degrees else 1.0
+        self._offset = np.pi*self._scale if self.abs else 0.0
+
     def process(self, input):
-        angle = np.arctan2(input[1][1]-input[0][1], input[1][0]-input[0][0])
-        if self.abs:
-            angle += np.pi
-        if self.degrees:
-            angle = angle*(180/np.pi)
-        return angle
+        angle = math.atan2(input[1][1]-input[0][1], input[1][0]-input[0][0])
+        return angle*self._scale + self._offset
+
+    def process_batch(self, input:np.ndarray) -> np.ndarray:
+        """
+        Compute angles for many pairs of points at once
+
+        Args:
+            input (:class:`numpy.ndarray`): (N, 2, 2) array of N pairs of [x, y] points
+
+        Returns:
+            :class:`numpy.ndarray`: (N,) array of angles
+        """
+        input = np.asarray(input, dtype=float)
+        diff = np.subtract(input[:,1,:], input[:,0,:])
+        out = np.arctan2(diff[:,1], diff[:,0])
+        out *= self._scale
+        out += self._offset
+        return out
 
 
 class IMU_Orientation(Transform):
@@ -108,7 +146,7 @@ class IMU_Orientation(Transform):
         super(IMU_Orientation, self).__init__(*args, **kwargs)
 
         self.invert_gyro = invert_gyro # type: bool
-        self._last_update = None # type: typing.Optional[float]
+        self._last_update = None # type: typing.Optional[int]
         self._dt = 0 # type: float
         # preallocate orientation array for filtered values
         self.orientation = np.zeros((2), dtype=float) # type: np.ndarray
@@ -116,15 +154,23 @@ class IMU_Orientation(Transform):
         self._orientation = np.zeros((2), dtype=float)  # type: np.ndarray
 
         self.kalman = None # type: typing.Optional[Kalman]
+        self._kalman_step = None # type: typing.Optional[typing.Callable]
         if use_kalman:
             self.kalman = Kalman(dim_state=2, dim_measurement=2, dim_control=2)  # type: typing.Optional[Kalman]
+            self._kalman_step = self.kalman.step
 
-    def process(self, accelgyro:typing.Union[typing.Tuple[np.ndarray, np.ndarray], np.ndarray]) -> np.ndarray:
+    def process(self, accelgyro:typing.Union[typing.Tuple[np.ndarray, np.ndarray], np.ndarray],
+                out:typing.Optional[np.ndarray]=None) -> np.ndarray:
         """
+        Dispatch to :meth:`.process_accel` or :meth:`.process_accel_gyro` depending on the input.
+
+        When the type of input is known ahead of time (eg. in a tight acquisition loop),
+        call those methods directly to skip the type checking.
 
         Args:
             accelgyro (tuple, :class:`numpy.ndarray`): tuple of (accelerometer[x,y,z], gyro[x,y,z]) readings as arrays, or
                 an array of just accelerometer[x,y,z]
+            out (:class:`numpy.ndarray`, None): Optional (2,) array to write [roll, pitch] into
 
         Returns:
             :class:`numpy.ndarray`: filtered [roll, pitch] calculations in degrees
@@ -132,58 +178,97 @@ class IMU_Orientation(Transform):
         # check what we were given...
         if isinstance(accelgyro, (tuple, list)) and len(accelgyro) == 2:
             # combined accelerometer and gyroscope readings
-            accel, gyro = accelgyro
-        elif isinstance(accelgyro, np.ndarray) and np.squeeze(accelgyro).shape[0] == 3:
+            return self.process_accel_gyro(accelgyro[0], accelgyro[1], out)
+        elif isinstance(accelgyro, np.ndarray) and accelgyro.size == 3:
             # just accelerometer readings
-            accel = accelgyro
-            gyro = None
+            return self.process_accel(accelgyro, out)
         else:
             # idk lol
             self.logger.exception(f'Need input to be a tuple of accelerometer and gyroscope readings, or an array of accelerometer readings. got {accelgyro}')
             return
 
-        # convert accelerometer readings to roll and pitch
-        pitch = 180*np.arctan2(accel[0], np.sqrt(accel[1]**2 + accel[2]**2))/np.pi
-        roll = 180*np.arctan2(accel[1], np.sqrt(accel[0]**2 + accel[2]**2))/np.pi
+    def process_accel(self, accel:np.ndarray, out:typing.Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Compute orientation from accelerometer readings alone
 
+        Args:
+            accel (:class:`numpy.ndarray`): accelerometer[x,y,z] readings
+            out (:class:`numpy.ndarray`, None): Optional (2,) array to write [roll, pitch] into
+
+        Returns:
+            :class:`numpy.ndarray`: filtered [roll, pitch] calculations in degrees
+        """
+        # convert accelerometer readings to roll and pitch
+        roll, pitch = _accel_to_rp(float(accel[0]), float(accel[1]), float(accel[2]))
 
         if self.kalman is None:
             # store orientations in external attribute if not using kalman filter
             self.orientation[:] = (roll, pitch)
-            return self.orientation.copy()
-        else:
-            # if using kalman filter, use private array to store raw orientation
-            self._orientation[:] = (roll, pitch)
+            return self._output(out)
 
+        # if using kalman filter, use private array to store raw orientation
+        self._orientation[:] = (roll, pitch)
+        self.kalman.process(self._orientation, out=self.orientation)
         # TODO: Don't assume that we're fed samples instantatneously -- ie. once data representations are stable, need to accept a timestamp here rather than making one
-        if self._last_update is None or gyro is None:
-            # first time through don't have dt to scale gyro by
-            self.orientation[:] = np.squeeze(self.kalman.process(self._orientation))
-            self._last_update = time()
+        self._last_update = monotonic_ns()
 
-        else:
-            if self.invert_gyro:
-                gyro *= -1
+        return self._output(out)
+
+    def process_accel_gyro(self, accel:np.ndarray, gyro:np.ndarray,
+                           out:typing.Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Compute orientation by fusing accelerometer and gyroscope readings
 
-            # get dt for time since last update
-            update_time = time()
-            self._dt = update_time-self._last_update
-            self._last_update = update_time
+        If not using the kalman filter, or if this is the first sample (so we can't scale
+        the gyro by the time since the last sample), the gyroscope reading is ignored.
 
-            if self._dt>1:
-                # if it's been really long, the gyro read is pretty much useless and will give ridiculous reads
-                self.orientation[:] = np.squeeze(self.kalman.process(self._orientation))
-            else:
-                # run predict and update stages separately to incorporate gyro
-                self.kalman.predict(u=gyro[0:2]*self._dt)
-                self.orientation[:] = np.squeeze(self.kalman.update(self._orientation))
+        Args:
+            accel (:class:`numpy.ndarray`): accelerometer[x,y,z] readings
+            gyro (:class:`numpy.ndarray`): gyroscope[x,y,z] readings
+            out (:class:`numpy.ndarray`, None): Optional (2,) array to write [roll, pitch] into
+
+        Returns:
+            :class:`numpy.ndarray`: filtered [roll, pitch] calculations in degrees
+        """
+        if self.kalman is None or self._last_update is None:
+            return self.process_accel(accel, out)
+
+        # convert accelerometer readings to roll and pitch
+        self._orientation[:] = _accel_to_rp(float(accel[0]), float(accel[1]), float(accel[2]))
 
-        return self.orientation.copy()
+        if self.invert_gyro:
+            gyro *= -1
+
+        # get dt for time since last update
+        update_time = monotonic_ns()
+        self._dt = (update_time-self._last_update) * 1e-9
+        self._last_update = update_time
+
+        if self._dt>1:
+            # if it's been really long, the gyro read is pretty much useless and will give ridiculous reads
+            self.kalman.process(self._orientation, out=self.orientation)
+        else:
+            # predict with the gyro as the control vector, then update with the accelerometer
+            self._kalman_step(gyro[0:2]*self._dt, self._orientation, out=self.orientation)
+
+        return self._output(out)
+
+    def _output(self, out:typing.Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Copy :attr:`.orientation` into ``out``, or into a new array if None
+        """
+        if out is None:
+            return self.orientation.copy()
+        out[:] = self.orientation
+        return out
 
 
 class Rotate(Transform):
     """
-    Rotate in 3 dimensions using :class:`scipy.spatial.transform.Rotation`
+    Rotate in 3 dimensions, equivalent to :class:`scipy.spatial.transform.Rotation`
+
+    Euler angles are converted to a rotation matrix once per distinct rotation, and
+    applied with a single matrix product.
 
     Args:
         dims ( "xyz" ): string specifying which axes the rotation will be around, eg ``"xy"`` , ``"xyz"```
@@ -215,33 +300,37 @@ class Rotate(Transform):
 
         # store dims and something we can slice with for dims and inverse
         self.dims = dims
-        self._dims = [self._DIMS[dim] for dim in dims]
+        self._dims = np.array([self._DIMS[dim] for dim in dims], dtype=np.intp)
 
         if not inverse:
             self.inverse = False
             self._inverse = None
         else:
             self.inverse = inverse
-            self._inverse = [self._DIMS[dim] for dim in inverse]
+            self._inverse = np.array([self._DIMS[dim] for dim in inverse], dtype=np.intp)
 
-        # stash rotation creation method depending on rotation_type
+        # stash rotation creation method depending on rotation_type,
+        # each returns a 3x3 rotation matrix
         if rotation_type == "euler":
-            self._rotate_constructor = R.from_euler
+            self._rotate_constructor = _cached_euler_matrix
+            self._batch_constructor = _euler_matrices
         else:
             e = NotImplementedError('Only euler is implemented currently!')
             self.logger.exception(e)
             raise e
 
+        # bytes of the current rotation array, to tell when it changes
+        self._rotation_key = None # type: typing.Optional[typing.Tuple[bytes, str]]
+
         # if we were provided an initial rotation, instantiate rotation here
-        if rotation:
+        self._rotation = None
+        self._matrix = None # type: typing.Optional[np.ndarray]
+        if rotation is not None:
+            rotation = np.array(rotation, dtype=float)
             # inverse what must be inverted
             if self.inverse:
-                rotation[self._inverse] *= -1
-            self._rotation = rotation
-            self._rotator = self._rotate_constructor(self.dims, self._rotation, degrees=self.degrees)
-        else:
-            self._rotation = None
-            self._rotator = None
+                np.negative.at(rotation, self._inverse)
+            self._set_rotation(rotation)
 
     def process(self, input):
         """
@@ -260,26 +349,62 @@ class Rotate(Transform):
             # split out input coords and rotation
             input, rotate = input
 
-            # invert what must be inverted
+            # invert what must be inverted, in place
             if self.inverse:
-                rotate[self._inverse] *= -1
+                rotate = np.asarray(rotate)
+                np.negative.at(rotate, self._inverse)
 
         else:
             rotate = None
 
         # if given a new rotation, use it
-        if rotate is not None and (self._rotation is None or not np.array_equal(rotate, self._rotation)):
-            self._rotator = self._rotate_constructor(self.dims, rotate, degrees=self.degrees)
-            self._rotation = rotate
+        if rotate is not None:
+            self._set_rotation(rotate)
+
+        if self._matrix is None:
+            e = RuntimeError('No rotation was provided, and none is available!')
+            self.logger.exception(e)
+            raise e
 
         # apply itttt and return
-        try:
-            return self._rotator.apply(input)
-        except AttributeError:
-            if self._rotator is None:
-                e = RuntimeError('No rotation was provided, and none is available!')
-                self.logger.exception(e)
-                raise e
+        return np.dot(input, self._matrix.T)
+
+    def process_batch(self, inputs:np.ndarray, rotations:np.ndarray) -> np.ndarray:
+        """
+        Rotate many points, each by its own rotation, at once.
+
+        Rather than calling :meth:`.process` in a loop, build a stack of rotation matrices
+        and apply them all with a single :func:`numpy.einsum` . Does not change the
+        rotation used by :meth:`.process` .
+
+        Args:
+            inputs (:class:`numpy.ndarray`): (N, 3) array of points to rotate
+            rotations (:class:`numpy.ndarray`): (N, len(dims)) array of rotations, one per point
+
+        Returns:
+            :class:`numpy.ndarray`: (N, 3) array of rotated points
+        """
+        rotations = np.array(rotations, dtype=float, ndmin=2)
+        if self.inverse:
+            rotations[:, self._inverse] *= -1
+
+        matrices = self._batch_constructor(self.dims, rotations, degrees=self.degrees)
+        return np.einsum('nij,nj->ni', matrices, inputs)
+
+    def _set_rotation(self, rotate: np.ndarray):
+        """
+        Update :attr:`._matrix` if ``rotate`` differs from the current rotation.
+
+        Compares the raw bytes of the rotation rather than the array object, so arrays
+        that are reused and modified in place by the caller are still noticed.
+        """
+        rotate = np.asarray(rotate)
+        key = (rotate.tobytes(), rotate.dtype.str)
+        if key != self._rotation_key:
+            self._matrix = self._rotate_constructor(self.dims, key[0], key[1], self.degrees)
+            self._rotation_key = key
+            self._rotation = rotate
+
 
 class Spheroid(Transform):
     """
@@ -325,6 +450,9 @@ class Spheroid(Transform):
         source (tuple): parameterization of spheroid to transform from in the same 6-tuple form as ``target``,
             if None is passed, assume we will use :meth:`.Spheroid.fit`
         fit (None, :class:`numpy.ndarray`): Initialize with values to fit, if None assume fit will be called later.
+        dtype (:class:`numpy.dtype`): dtype of transformed points (default ``np.float64``). Passing ``np.float32``
+            halves the memory moved when transforming large arrays, at the cost of reduced precision
+            (usually fine for accelerometer readings).
 
 
     References:
@@ -335,11 +463,13 @@ class Spheroid(Transform):
     def __init__(self, target=(1,1,1,0,0,0),
                  source:tuple=(None, None, None, None, None, None),
                  fit:typing.Optional[np.ndarray]=None,
+                 dtype:typing.Type[np.floating]=np.float64,
                  *args, **kwargs):
         super(Spheroid, self).__init__(*args, **kwargs)
 
         self.target = target
         self.source  = source
+        self.dtype = np.dtype(dtype)
 
         self._scale = None
         self._offset_source = None
@@ -353,9 +483,9 @@ class Spheroid(Transform):
         if not any([val is None for val in self.source]):
             self._scale = np.array((self.target[0]/self.source[0],
                                     self.target[1]/self.source[1],
-                                    self.target[2]/self.source[2]))
-            self._offset_source = np.array((self.source[3], self.source[4], self.source[5]))
-            self._offset_target = np.array((self.target[3], self.target[4], self.target[5]))
+                                    self.target[2]/self.source[2]), dtype=self.dtype)
+            self._offset_source = np.array((self.source[3], self.source[4], self.source[5]), dtype=self.dtype)
+            self._offset_target = np.array((self.target[3], self.target[4], self.target[5]), dtype=self.dtype)
 
     def fit(self, points, **kwargs):
         """
@@ -363,6 +493,9 @@ class Spheroid(Transform):
 
         updates the :attr:`._scale` and :attr:`._offset` private arrays used to manipulate input data
 
+        If no ``kwargs`` are passed, use the closed-form :meth:`.fit_linear` , otherwise
+        (or if the linear fit does not give a valid ellipsoid) use :func:`scipy.optimize.curve_fit`
+
         .. note::
 
             It's usually important to pass ``bounds`` to :func:`scipy.optimize.curve_fit` !!! passed as a 2-tuple
@@ -376,23 +509,72 @@ class Spheroid(Transform):
         Returns:
             tuple: parameters of fit ellipsoid (a,b,c,x,y,z)
         """
+        if not kwargs:
+            parameters = self.fit_linear(points)
+            if parameters is not None:
+                return parameters
+
         if 'bounds' in kwargs.keys():
             bounds = kwargs.pop('bounds')
         else:
             bounds = ((0,      0,      0,      -np.inf, -np.inf, -np.inf),
                       (np.inf, np.inf, np.inf,  np.inf,  np.inf,  np.inf))
 
+        # split columns once rather than re-slicing on every iteration of the fit
+        x_fit, y_fit, z_fit = (np.ascontiguousarray(points[:,i], dtype=float) for i in range(3))
+
+        def _fit_func(_, a, b, c, x, y, z):
+            return _ellipsoid_cols(x_fit, y_fit, z_fit, a, b, c, x, y, z)
+
         y = np.ones((points.shape[0]))
-        parameters, _ = curve_fit(_ellipsoid_func, points, y, bounds=bounds, **kwargs)
+        parameters, _ = curve_fit(_fit_func, y, y, bounds=bounds, **kwargs)
+        self.source = parameters
+        self._update_arrays()
+        return parameters
+
+    def fit_linear(self, points) -> typing.Optional[np.ndarray]:
+        """
+        Fit an axis-aligned spheroid with linear least squares.
+
+        Expanding the ellipsoid equation gives one that is linear in its coefficients::
+
+            A*x^2 + B*y^2 + C*z^2 + D*x + E*y + F*z = 1
+
+        which is solved with :func:`numpy.linalg.lstsq` and converted back to (a,b,c,x,y,z)
+        by completing the square.
+
+        Args:
+            points (:class:`numpy.ndarray`): (M, 3) array of points to fit
+
+        Returns:
+            :class:`numpy.ndarray`: parameters of fit ellipsoid (a,b,c,x,y,z), or None if the points
+            don't describe an ellipsoid (in which case :attr:`.source` is not updated)
+        """
+        points = np.asarray(points, dtype=float)
+        A = np.column_stack((points*points, points))
+        p, *_ = np.linalg.lstsq(A, np.ones(points.shape[0]), rcond=None)
+
+        quad, lin = p[0:3], p[3:6]
+        if np.any(quad <= 0):
+            self.logger.warning(f'linear fit did not give an ellipsoid, got coefficients {p}')
+            return None
+
+        center = -lin / (2*quad)
+        radii = np.sqrt((1 + np.sum(quad * center**2)) / quad)
+
+        parameters = np.concatenate((radii, center))
         self.source = parameters
         self._update_arrays()
+        return parameters
 
-    def process(self, input:np.ndarray):
+    def process(self, input:np.ndarray, out:typing.Optional[np.ndarray]=None):
         """
         Transform input (x,y,z) points such that points in :attr:`.source` are mapped to those in :attr:`.target`
 
         Args:
             input (:class:`numpy.ndarray`): x, y, and z coordinates
+            out (:class:`numpy.ndarray`, None): Optional array of the same shape as ``input`` to write into,
+                eg. to reuse one buffer across calls. Otherwise a new array is returned.
 
         Returns:
             :class:`numpy.ndarray` : coordinates transformed according to the spheroid requested
@@ -401,9 +583,16 @@ class Spheroid(Transform):
             self.logger.exception('process called without fit being performed or source ellipsoid provided! returning untransformed points!')
             return input
 
-        # move to the center, then scale, then offset.
+        if out is None:
+            # input is cast to self.dtype as it is read by the first operation, rather than copied
+            input = np.asarray(input)
+            out = np.empty(input.shape, dtype=self.dtype)
 
-        return ((input - self._offset_source) * self._scale) + self._offset_target
+        # move to the center, then scale, then offset -- in place to avoid temporaries
+        np.subtract(input, self._offset_source, out=out)
+        np.multiply(out, self._scale, out=out)
+        np.add(out, self._offset_target, out=out)
+        return out
 
     def generate(self, n:int, which:str='source', noise:float=0):
         """
@@ -429,17 +618,137 @@ class Spheroid(Transform):
             self.logger.exception(f"Dont know how to generate points for which == {which}")
             return
 
-        u = np.random.rand(n)
-        v = np.random.rand(n)
-        theta = u * 2.0 * np.pi
-        phi = np.arccos(2.0 * v - 1.0)
-        sinTheta, cosTheta = np.sin(theta), np.cos(theta)
-        sinPhi,   cosPhi   = np.sin(phi),   np.cos(phi)
-        rx = (a * sinPhi * cosTheta) + x + (np.random.rand(n) * noise)
-        ry = (b * sinPhi * sinTheta) + y + (np.random.rand(n) * noise)
-        rz = (c * cosPhi) + z + (np.random.rand(n) * noise)
-        return np.column_stack((rx, ry, rz))
+        # draw all uniforms at once: theta, phi, and noise for each dimension
+        u = np.random.rand(n, 5)
+        theta = u[:,0] * (2.0 * np.pi)
+        # cos(arccos(v)) == v, and sin(arccos(v)) == sqrt(1-v^2)
+        cosPhi = 2.0 * u[:,1] - 1.0
+        sinPhi = np.sqrt(1.0 - cosPhi*cosPhi)
+
+        # write each dimension directly into the output array
+        out = np.empty((n, 3))
+        np.cos(theta, out=out[:,0])
+        np.sin(theta, out=out[:,1])
+        out[:,0:2] *= sinPhi[:,None]
+        out[:,2] = cosPhi
+        out *= (a, b, c)
+        out += (x, y, z)
+        if noise:
+            u[:,2:5] *= noise
+            out += u[:,2:5]
+        return out
+
+
+
+def _euler_matrix(dims:str, angles:typing.Sequence[float], degrees:bool=True) -> np.ndarray:
+    """
+    Build a 3x3 rotation matrix from extrinsic euler angles, equivalent to
+    ``scipy.spatial.transform.Rotation.from_euler(dims, angles, degrees).as_matrix()``
+    but without the overhead of constructing a :class:`~scipy.spatial.transform.Rotation`
+    for the small inputs :class:`.Rotate` usually gets.
+
+    Args:
+        dims (str): axes to rotate around, eg. ``"xyz"``
+        angles (sequence): one angle per axis in ``dims``
+        degrees (bool): if True (default), angles are in degrees, otherwise radians
 
+    Returns:
+        :class:`numpy.ndarray`: (3, 3) rotation matrix
+    """
+    matrix = np.eye(3)
+    for dim, angle in zip(dims, np.atleast_1d(angles)):
+        if degrees:
+            angle = math.radians(angle)
+        sin, cos = math.sin(angle), math.cos(angle)
+        if dim == 'x':
+            axis = np.array(((1., 0., 0.), (0., cos, -sin), (0., sin, cos)))
+        elif dim == 'y':
+            axis = np.array(((cos, 0., sin), (0., 1., 0.), (-sin, 0., cos)))
+        else:
+            axis = np.array(((cos, -sin, 0.), (sin, cos, 0.), (0., 0., 1.)))
+        # extrinsic rotations, each subsequent rotation is applied on the left
+        matrix = axis @ matrix
+    return matrix
+
+
+@lru_cache(maxsize=128)
+def _cached_euler_matrix(dims:str, rotation:bytes, dtype:str, degrees:bool=True) -> np.ndarray:
+    """
+    :func:`._euler_matrix` for :class:`.Rotate` , cached by the raw bytes of the rotation array.
+
+    The returned matrix is shared between callers, so it is made read-only.
+
+    Args:
+        dims (str): axes to rotate around, eg. ``"xyz"``
+        rotation (bytes): ``angles.tobytes()``
+        dtype (str): ``angles.dtype.str``
+        degrees (bool): if True (default), angles are in degrees, otherwise radians
+
+    Returns:
+        :class:`numpy.ndarray`: (3, 3) read-only rotation matrix
+    """
+    matrix = _euler_matrix(dims, np.frombuffer(rotation, dtype=dtype), degrees=degrees)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _euler_matrices(dims:str, angles:np.ndarray, degrees:bool=True) -> np.ndarray:
+    """
+    Vectorized :func:`._euler_matrix` -- build a stack of rotation matrices from
+    an (N, len(dims)) array of extrinsic euler angles.
+
+    Args:
+        dims (str): axes to rotate around, eg. ``"xyz"``
+        angles (:class:`numpy.ndarray`): (N, len(dims)) array of angles
+        degrees (bool): if True (default), angles are in degrees, otherwise radians
+
+    Returns:
+        :class:`numpy.ndarray`: (N, 3, 3) stack of rotation matrices
+    """
+    angles = np.asarray(angles, dtype=float)
+    if degrees:
+        angles = np.radians(angles)
+    sin, cos = np.sin(angles), np.cos(angles)
+
+    n = angles.shape[0]
+    matrices = np.broadcast_to(np.eye(3), (n, 3, 3))
+    axis = np.empty((n, 3, 3))
+    for i, dim in enumerate(dims):
+        # indices of the plane being rotated, in the order that gives a right-handed rotation
+        j, k = {'x': (1, 2), 'y': (2, 0), 'z': (0, 1)}[dim]
+        axis[:] = 0
+        axis[:, Rotate._DIMS[dim], Rotate._DIMS[dim]] = 1
+        axis[:, j, j] = cos[:, i]
+        axis[:, k, k] = cos[:, i]
+        axis[:, j, k] = -sin[:, i]
+        axis[:, k, j] = sin[:, i]
+        # extrinsic rotations, each subsequent rotation is applied on the left
+        matrices = axis @ matrices
+    return np.ascontiguousarray(matrices)
+
+
+def _accel_to_rp(ax:float, ay:float, az:float) -> typing.Tuple[float, float]:
+    """
+    Convert accelerometer readings to roll and pitch for :meth:`.IMU_Orientation.process`
+
+    Compiled with :func:`numba.njit` if numba is available, otherwise
+    uses scalar :mod:`math` functions to avoid numpy's per-call overhead.
+
+    Args:
+        ax (float): x acceleration
+        ay (float): y acceleration
+        az (float): z acceleration
+
+    Returns:
+        tuple: (roll, pitch) in degrees
+    """
+    inv = 180.0/math.pi
+    pitch = math.atan2(ax, math.sqrt(ay*ay + az*az))*inv
+    roll = math.atan2(ay, math.sqrt(ax*ax + az*az))*inv
+    return roll, pitch
+
+if NUMBA:
+    _accel_to_rp = njit(cache=True, fastmath=True)(_accel_to_rp)
 
 
 def _ellipsoid_func(fit, a, b, c, x, y, z):
@@ -458,8 +767,28 @@ def _ellipsoid_func(fit, a, b, c, x, y, z):
     Returns:
         float: result of ellipsoid function, minimize parameters to == 1
     """
-    x_fit, y_fit, z_fit = fit[:,0], fit[:,1], fit[:,2]
-    return ((x_fit - x)**2 / a**2) + ((y_fit - y)**2 / b**2) + ((z_fit - z)**2 / c**2)
+    return _ellipsoid_cols(fit[:,0], fit[:,1], fit[:,2], a, b, c, x, y, z)
+
+
+def _ellipsoid_cols(x_fit, y_fit, z_fit, a, b, c, x, y, z):
+    """
+    :func:`._ellipsoid_func` with x, y, and z points given as separate 1-D arrays,
+    computed with in-place operations to minimize temporary arrays.
+    """
+    out = np.subtract(x_fit, x)
+    out *= out
+    out *= 1/(a*a)
+
+    tmp = np.subtract(y_fit, y)
+    tmp *= tmp
+    tmp *= 1/(b*b)
+    out += tmp
+
+    np.subtract(z_fit, z, out=tmp)
+    tmp *= tmp
+    tmp *= 1/(c*c)
+    out += tmp
+    return out
 
 
 
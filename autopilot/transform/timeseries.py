@@ -319,7 +319,7 @@ class Kalman(Transform):
         np.copyto(self.P_prior, self.P_cov)
 
 
-    def update(self, z:np.ndarray, R=None, H=None) -> np.ndarray:
+    def update(self, z:np.ndarray, R=None, H=None, out:typing.Optional[np.ndarray]=None) -> np.ndarray:
         """
         Add a new measurement (z_measure) to the Kalman filter.
 
@@ -336,6 +336,8 @@ class Kalman(Transform):
                 one call, otherwise  self.R_measure_var will be used.
             H (:class:`numpy.ndarray`, None): Optionally provide H_measure to override the measurement function for this
                 one call, otherwise self.H_measure will be used.
+            out (:class:`numpy.ndarray`, None): Optionally provide an array to copy the updated state into
+                (eg. a preallocated ``(dim_state,)`` array), which is returned instead of :attr:`.x_state`
         """
 
         # set to None to force recompute
@@ -390,6 +392,10 @@ class Kalman(Transform):
         np.copyto(self.z_measure, z)
         np.copyto(self.x_post, self.x_state)
         np.copyto(self.P_post, self.P_cov)
+
+        if out is not None:
+            np.copyto(out, self.x_state.reshape(out.shape))
+            return out
         return self.x_state
 
     def _reshape_z(self, z, dim_z, ndim):
@@ -410,16 +416,17 @@ class Kalman(Transform):
 
         return z
 
-    def process(self, z, **kwargs):
+    def process(self, z, out:typing.Optional[np.ndarray]=None, **kwargs):
         """
         Call predict and update, passing the relevant kwargs
 
         Args:
             z ():
+            out (:class:`numpy.ndarray`, None): passed to :meth:`.update`
             **kwargs ():
 
         Returns:
-            np.ndarray: self.x_state
+            np.ndarray: self.x_state, or ``out`` if provided
         """
 
         # prepare args for predict and call
@@ -428,14 +435,30 @@ class Kalman(Transform):
 
         # same thing for update
         update_kwargs = {k: kwargs.get(k, None) for k in ('R', 'H')}
-        return self.update(z, **update_kwargs)
+        return self.update(z, out=out, **update_kwargs)
+
+
+
 
 
 
 
 
+    def step(self, u, z, out:typing.Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Predict with a control vector and update with a measurement in a single call,
+        using the filter's own matrices.
 
+        Args:
+            u (:class:`numpy.ndarray`): control vector, passed to :meth:`.predict`
+            z (:class:`numpy.ndarray`): measurement, passed to :meth:`.update`
+            out (:class:`numpy.ndarray`, None): passed to :meth:`.update`
 
+        Returns:
+            np.ndarray: self.x_state, or ``out`` if provided
+        """
+        self.predict(u)
+        return self.update(z, out=out)
 
     def residual_of(self, z):
         """
@@ -6,6 +6,7 @@ for now don't have a clear other place to be
 import inspect
 import importlib
 import json
+import os
 import sys
 from pathlib import Path
 import pkgutil
@@ -14,6 +15,12 @@ import typing
 from threading import Thread
 import numpy as np
 
+try:
+    import orjson
+    ORJSON = True
+except ImportError:
+    ORJSON = False
+
 
 def list_classes(module) -> typing.List[typing.Tuple[str, str]]:
     """
@@ -150,12 +157,36 @@ def list_subjects(pilot_db=None):
 
     subjects = []
     for pilot, values in pilot_db.items():
-        if 'subjects' in values.keys():
+        if 'subjects' in values:
             subjects.extend(values['subjects'])
 
     return subjects
 
 
+def list_protocols(protocol_dir:typing.Optional[typing.Union[str, Path]]=None) -> typing.List[str]:
+    """
+    List the names of the protocols (``.json`` files, without their extension) in a directory.
+
+    Args:
+        protocol_dir (str, :class:`pathlib.Path`): directory to list. if None, use ``prefs.get('PROTOCOLDIR')``
+
+    Returns:
+        list: protocol names, sorted
+    """
+    if protocol_dir is None:
+        from autopilot import prefs
+        protocol_dir = prefs.get('PROTOCOLDIR')
+
+    with os.scandir(protocol_dir) as entries:
+        return sorted(entry.name[:-5] for entry in entries
+                      if entry.name.endswith('.json') and entry.is_file())
+
+
+_PILOTDB_BUFFER = 256*1024
+"""
+Buffer size for writing the pilot_db, rather than python's 8KiB default
+"""
+
 def load_pilotdb(file_name=None, reverse=False):
     """
     Try to load the file_db
@@ -171,8 +202,7 @@ def load_pilotdb(file_name=None, reverse=False):
     if file_name is None:
         file_name = '/usr/autopilot/pilot_db.json'
 
-    with open(file_name) as pilot_file:
-        pilot_db = json.load(pilot_file)
+    pilot_db = json_loads(_read_bytes(file_name, os.stat(file_name).st_size))
 
     if reverse:
         # simplify pilot db
@@ -186,6 +216,78 @@ def load_pilotdb(file_name=None, reverse=False):
     return pilot_db
 
 
+def save_pilotdb(pilot_db:dict, file_name:typing.Union[str, Path]):
+    """
+    Write a pilot_db to disk as json
+
+    Args:
+        pilot_db (dict): the pilot_db to save
+        file_name (str, :class:`pathlib.Path`): file to save to (usually ``prefs.get('PILOT_DB')`` )
+    """
+    with open(file_name, 'wb', buffering=_PILOTDB_BUFFER) as pilot_file:
+        pilot_file.write(json_dumps(pilot_db))
+
+
+def _read_bytes(file_name:typing.Union[str, Path], size:int) -> bytes:
+    """
+    Read a whole file with a single unbuffered ``read`` of its (already known) size,
+    rather than going through python's buffered io layer.
+
+    Args:
+        file_name (str, :class:`pathlib.Path`): file to read
+        size (int): size of the file in bytes, eg. from :func:`os.stat`
+
+    Returns:
+        bytes: contents of the file
+    """
+    fd = os.open(file_name, os.O_RDONLY)
+    try:
+        chunks = [os.read(fd, size)]
+        # reads can come up short, eg. on network filesystems or if the file grew
+        while True:
+            chunk = os.read(fd, _PILOTDB_BUFFER)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks)
+
+
+def json_loads(data:typing.Union[bytes, str]):
+    """
+    Parse json with :mod:`orjson` if it is available, otherwise the standard library :mod:`json`
+
+    Python dicts preserve insertion order, so objects keep the order they have in the file.
+
+    Args:
+        data (bytes, str): serialized json
+
+    Returns:
+        the parsed object
+    """
+    if ORJSON:
+        return orjson.loads(data)
+    else:
+        return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """
+    Serialize to indented json with :mod:`orjson` if it is available, otherwise the standard library :mod:`json`
+
+    Args:
+        obj: object to serialize
+
+    Returns:
+        bytes: utf-8 encoded json
+    """
+    if ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 def coerce_discrete(df, col, mapping={'L':0, 'R':1}):
     """
     Coerce a discrete/string column of a pandas dataframe into numeric values
@@ -25,6 +25,11 @@ PACKAGES = []
 
 REQUIREMENTS = []
 
+# optional accelerators, used if they are installed
+EXTRAS = {
+    'fast': ['orjson', 'numba']
+}
+
 
 
 # detect if on raspberry pi
@@ -119,6 +124,7 @@ setup(
     packages=packs,
     #cmake_args=CMAKE_ARGS,
     install_requires = REQUIREMENTS,
+    extras_require = EXTRAS,
     classifiers=[
         "Programming Language :: Python :: 3.7",
         "Development Status :: 4 - Beta",
@@ -1,4 +1,5 @@
 from time import sleep
+import threading
 from pathlib import Path
 import json
 
@@ -45,3 +46,145 @@ def test_terminal_launch(qtbot, spawn_terminal):
 
     assert terminal.isVisible()
 
+
+
+@pytest.fixture
+def control_panel(qtbot, monkeypatch):
+    """
+    A :class:`.Control_Panel` with one pilot, recording writes to the pilot db rather than making them
+    """
+    from autopilot.core import gui
+
+    saves = []
+    monkeypatch.setattr(gui, 'save_pilotdb',
+                        lambda pilot_db, file_name: saves.append(json.loads(json.dumps(pilot_db))))
+
+    panel = gui.Control_Panel(subjects={}, start_fn=lambda *args: None, ping_fn=lambda *args: None,
+                              pilots={"testpilot_1": {"ip": "192.168.0.0", "subjects": ['subject_1']}})
+    panel.DB_FLUSH_DELAY = 50
+    qtbot.addWidget(panel)
+    return panel, saves
+
+
+@pytest.fixture
+def fake_wizard(monkeypatch):
+    """
+    Replace the :class:`.New_Subject_Wizard` with one that immediately accepts a new subject
+    """
+    from autopilot.core import gui
+
+    class Tab:
+        def __init__(self, values):
+            self.values = values
+
+    class Wizard:
+        def __init__(self):
+            self.bio_tab = Tab({'id': 'subject_new'})
+            self.task_tab = Tab({})
+
+        def exec_(self):
+            pass
+
+        def result(self):
+            return 1
+
+    monkeypatch.setattr(gui, 'New_Subject_Wizard', Wizard)
+
+
+def test_update_db_coalesced(qtbot, control_panel):
+    panel, saves = control_panel
+
+    panel.update_db()
+    panel.update_db(new={'testpilot_2': {'ip': '192.168.0.1', 'subjects': []}})
+
+    qtbot.waitUntil(lambda: len(saves) == 1, timeout=1000)
+    qtbot.wait(panel.DB_FLUSH_DELAY * 4)
+    assert len(saves) == 1
+    assert list(saves[0].keys()) == ['testpilot_1', 'testpilot_2']
+
+    # a later change gets a write of its own
+    panel.update_db()
+    qtbot.waitUntil(lambda: len(saves) == 2, timeout=1000)
+
+
+def test_create_subject(qtbot, control_panel, fake_wizard, monkeypatch):
+    from autopilot.core import gui
+    panel, saves = control_panel
+
+    created = []
+    class Subject:
+        def __init__(self, name, new=False, biography=None):
+            created.append((name, threading.current_thread()))
+
+    monkeypatch.setattr(gui, 'Subject', Subject)
+
+    panel.create_subject('testpilot_1')
+
+    qtbot.waitUntil(lambda: 'subject_new' in panel.pilots['testpilot_1']['subjects'], timeout=1000)
+    # the subject file is made outside the GUI thread
+    assert created[0][0] == 'subject_new'
+    assert created[0][1] is not threading.main_thread()
+    assert 'subject_new' in panel.subjects
+
+    subject_list = panel.subject_lists['testpilot_1']
+    assert [subject_list.item(i).text() for i in range(subject_list.count())] == ['subject_1', 'subject_new']
+
+    qtbot.waitUntil(lambda: len(saves) == 1, timeout=1000)
+    assert saves[0]['testpilot_1']['subjects'] == ['subject_1', 'subject_new']
+
+
+def test_create_subject_error(qtbot, control_panel, fake_wizard, monkeypatch):
+    from autopilot.core import gui
+    panel, saves = control_panel
+
+    class Subject:
+        def __init__(self, *args, **kwargs):
+            raise RuntimeError('no room for subjects')
+
+    errors = []
+    class Dialog:
+        def exec_(self):
+            pass
+
+    def pop_dialog(message, details="", *args, **kwargs):
+        errors.append((message, details, kwargs.get('msg_type')))
+        return Dialog()
+
+    monkeypatch.setattr(gui, 'Subject', Subject)
+    monkeypatch.setattr(gui, 'pop_dialog', pop_dialog)
+
+    panel.create_subject('testpilot_1')
+
+    # the error is reported in a dialog, and the subject isn't added
+    qtbot.waitUntil(lambda: len(errors) == 1, timeout=1000)
+    assert errors[0][1] == 'no room for subjects'
+    assert errors[0][2] == 'error'
+    qtbot.wait(panel.DB_FLUSH_DELAY * 2)
+    assert panel.pilots['testpilot_1']['subjects'] == ['subject_1']
+    assert 'subject_new' not in panel.subjects
+    assert saves == []
+
+
+def test_about_to_quit(qtbot, control_panel, fake_wizard, monkeypatch):
+    from autopilot.core import gui
+    panel, saves = control_panel
+
+    class Subject:
+        def __init__(self, *args, **kwargs):
+            # still making the subject when the application quits
+            sleep(0.2)
+
+    monkeypatch.setattr(gui, 'Subject', Subject)
+
+    panel.create_subject('testpilot_1')
+    panel._about_to_quit()
+
+    # the subject thread was joined and the pilot db written without waiting for the timer
+    assert not any(t.is_alive() for t in panel._subject_threads)
+    assert panel.pilots['testpilot_1']['subjects'] == ['subject_1', 'subject_new']
+    assert len(saves) == 1
+    assert saves[0]['testpilot_1']['subjects'] == ['subject_1', 'subject_new']
+
+    # and the scheduled flush has nothing left to write
+    qtbot.wait(panel.DB_FLUSH_DELAY * 4)
+    assert len(saves) == 1
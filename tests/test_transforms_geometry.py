@@ -1,7 +1,12 @@
 import numpy as np
 import pdb
+import copy
+import pickle
 
-from autopilot.transform.geometry import Spheroid, _ellipsoid_func
+from scipy.spatial.distance import pdist, squareform
+from scipy.spatial.transform import Rotation as R
+
+from autopilot.transform.geometry import Spheroid, Angle, Distance, IMU_Orientation, Rotate, _ellipsoid_func
 
 n_samples = 100
 
@@ -72,3 +77,207 @@ def test_spheroid_process():
 
         assert np.allclose(pts_test, np.ones(1000))
         assert np.allclose(pts_tfm_test, np.ones(1000))
+
+def test_angle():
+    pts = (np.random.rand(n_samples, 2, 2)-0.5)*20
+
+    for abs in (True, False):
+        for degrees in (True, False):
+            angle = Angle(abs=abs, degrees=degrees)
+
+            expected = np.arctan2(pts[:,1,1]-pts[:,0,1], pts[:,1,0]-pts[:,0,0])
+            if abs:
+                expected += np.pi
+            if degrees:
+                expected = expected*(180/np.pi)
+
+            # scalar and batched paths should agree with the reference
+            assert np.allclose([angle.process(pt) for pt in pts], expected)
+            assert np.allclose(angle.process_batch(pts), expected)
+
+def test_distance_mean():
+    for i in range(n_samples):
+        pts = (np.random.rand(50, 3)-0.5)*20
+        for n_dim in (2, 3):
+            dist = Distance(n_dim=n_dim)
+            expected = np.mean(pdist(pts[:,0:n_dim]))
+            assert np.isclose(dist.process(pts), expected)
+
+            # points far from the origin shouldn't lose precision
+            far = pts + 1e6
+            assert np.isclose(dist.process(far), np.mean(pdist(far[:,0:n_dim])), rtol=1e-10)
+
+def test_distance_pairwise():
+    pts = (np.random.rand(50, 3)-0.5)*20
+    dist_square = Distance(pairwise=True, n_dim=3, metric='cityblock')
+    dist_condensed = Distance(pairwise=True, n_dim=3, squareform=False, metric='cityblock')
+    dist_mean = Distance(n_dim=3, metric='cityblock')
+
+    expected = pdist(pts, metric='cityblock')
+    square = dist_square.process(pts)
+    condensed = dist_condensed.process(pts)
+    assert np.allclose(square, squareform(expected))
+    assert np.allclose(condensed, expected)
+    assert np.isclose(dist_mean.process(pts), np.mean(expected))
+
+    # reused buffers shouldn't clobber previously returned outputs
+    dist_square.process(pts[::-1])
+    dist_condensed.process(pts[::-1])
+    assert np.allclose(square, squareform(expected))
+    assert np.allclose(condensed, expected)
+
+def test_imu_orientation_accel():
+    orientation = IMU_Orientation(use_kalman=False)
+    for i in range(n_samples):
+        accel = (np.random.rand(3)-0.5)*20
+
+        pitch = 180*np.arctan2(accel[0], np.sqrt(accel[1]**2 + accel[2]**2))/np.pi
+        roll = 180*np.arctan2(accel[1], np.sqrt(accel[0]**2 + accel[2]**2))/np.pi
+
+        assert np.allclose(orientation.process(accel), (roll, pitch))
+
+def test_imu_orientation_out():
+    orientation = IMU_Orientation()
+    accel = np.array((1., 2., 9.))
+
+    # returned arrays shouldn't alias the internal state
+    first = orientation.process(accel)
+    assert first is not orientation.orientation
+    assert np.array_equal(first, orientation.orientation)
+
+    # and each call returns a new array
+    kept = first.copy()
+    second = orientation.process(np.array((3., 1., 8.)))
+    assert second is not first
+    assert np.array_equal(first, kept)
+
+    out = np.zeros(2)
+    ret = orientation.process(accel, out=out)
+    assert ret is out
+    assert np.array_equal(out, orientation.orientation)
+
+def test_spheroid_fit_linear():
+    for i in range(n_samples):
+        target = ((np.random.rand()+5)*5,
+                  (np.random.rand()+5)*5,
+                  (np.random.rand()+5)*5,
+                  (np.random.rand()-0.5)*20,
+                  (np.random.rand()-0.5)*20,
+                  (np.random.rand()-0.5)*20)
+        sphere_generator = Spheroid(target=target)
+
+        # exact points should be recovered exactly
+        pts = sphere_generator.generate(1000, which="target", noise=0)
+        sphere_generator.fit(pts)
+        assert np.allclose(sphere_generator.source, target)
+
+        # noisy points should be close
+        noise = np.random.rand()
+        max_distance = np.sqrt((noise**2)*3)
+        pts = sphere_generator.generate(1000, which="target", noise=noise)
+        sphere_generator.fit_linear(pts)
+        for t_param, fit_param in zip(target, sphere_generator.source):
+            assert np.abs(t_param - fit_param) < max_distance
+
+def test_rotate():
+    rotate = Rotate(dims="xyz")
+    rotation = np.zeros(3)
+    for i in range(n_samples):
+        pts = (np.random.rand(10, 3)-0.5)*20
+        # reuse the same rotation array, modified in place
+        rotation[:] = (np.random.rand(3)-0.5)*360
+
+        expected = R.from_euler("xyz", rotation, degrees=True).apply(pts)
+        assert np.allclose(rotate.process((pts, rotation)), expected)
+
+        # the most recent rotation is used if none is passed
+        assert np.allclose(rotate.process(pts), expected)
+
+    # or a static rotation can be given on init
+    static = Rotate(dims="xyz", rotation=rotation)
+    assert np.allclose(static.process(pts), expected)
+
+def test_rotate_dims():
+    # arbitrary subsets and orders of axes should match scipy
+    for dims in ("x", "y", "z", "xy", "zx", "yzx", "zyx"):
+        for degrees in (True, False):
+            rotate = Rotate(dims=dims, degrees=degrees)
+            pts = (np.random.rand(10, 3)-0.5)*20
+            rotation = (np.random.rand(len(dims))-0.5)*6
+
+            expected = R.from_euler(dims, rotation, degrees=degrees).apply(pts)
+            assert np.allclose(rotate.process((pts, rotation)), expected)
+            # single points too
+            assert np.allclose(rotate.process(pts[0]), expected[0])
+
+def test_spheroid_process_float32():
+    target = (9.8, 9.8, 9.8, 0, 0, 0)
+    source = (10, 11, 12, 1, 2, 3)
+
+    sphere = Spheroid(target=target, source=source)
+    sphere_32 = Spheroid(target=target, source=source, dtype=np.float32)
+
+    pts = sphere.generate(1000, which="source", noise=0)
+    pts_tfm = sphere.process(pts)
+    pts_tfm_32 = sphere_32.process(pts)
+
+    assert pts_tfm.dtype == np.float64
+    assert pts_tfm_32.dtype == np.float32
+    assert np.allclose(pts_tfm, pts_tfm_32, atol=1e-4)
+
+    # successive calls shouldn't share an output array unless asked to
+    first = sphere.process(pts[0])
+    second = sphere.process(pts[1])
+    assert first is not second
+    assert not np.allclose(first, second)
+
+    out = np.empty(3)
+    assert sphere.process(pts[0], out=out) is out
+    assert np.allclose(out, first)
+
+def test_imu_orientation_dispatch():
+    accel = np.array((1., 2., 9.))
+    gyro = np.array((0.1, 0.2, 0.3))
+
+    dispatched = IMU_Orientation()
+    direct = IMU_Orientation()
+
+    assert np.allclose(dispatched.process(accel), direct.process_accel(accel))
+    # second sample has a dt, so gyro is fused
+    assert np.allclose(dispatched.process((accel, gyro)), direct.process_accel_gyro(accel, gyro), atol=1e-3)
+
+def test_rotate_batch():
+    for dims in ("xyz", "zx", "y"):
+        rotate = Rotate(dims=dims, inverse="x" if "x" in dims else "")
+        pts = (np.random.rand(n_samples, 3)-0.5)*20
+        rotations = (np.random.rand(n_samples, len(dims))-0.5)*360
+
+        batch = rotate.process_batch(pts, rotations)
+        looped = np.stack([rotate.process((pt, rotation.copy())) for pt, rotation in zip(pts, rotations)])
+        assert np.allclose(batch, looped)
+
+def test_rotate_inverse():
+    rotate = Rotate(dims="xyz", inverse="xz")
+    pts = (np.random.rand(10, 3)-0.5)*20
+    rotation = (np.random.rand(3)-0.5)*360
+    expected = R.from_euler("xyz", rotation*(-1, 1, -1), degrees=True).apply(pts)
+
+    assert np.allclose(rotate.process((pts, rotation.copy())), expected)
+    assert np.allclose(rotate.process((pts, list(rotation))), expected)
+
+def test_geometry_copy():
+    pts = (np.random.rand(10, 3)-0.5)*20
+    rotation = np.array((10., 20., 30.))
+
+    transforms = (
+        (Distance(n_dim=3), pts),
+        (Angle(), pts[0:2, 0:2]),
+        (IMU_Orientation(use_kalman=False), pts[0]),
+        (Rotate(rotation=rotation), pts),
+        (Spheroid(source=(2, 3, 4, 1, 2, 3)), pts)
+    )
+
+    for transform, input in transforms:
+        expected = copy.copy(transform.process(input))
+        for copied in (copy.deepcopy(transform), pickle.loads(pickle.dumps(transform))):
+            assert np.allclose(copied.process(input), expected)
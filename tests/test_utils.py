@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from autopilot.utils import common
+from autopilot.utils.common import load_pilotdb, save_pilotdb, list_protocols
+
+
+@pytest.mark.parametrize('orjson', [True, False])
+def test_pilotdb_roundtrip(tmp_path, monkeypatch, orjson):
+    if orjson and not common.ORJSON:
+        pytest.skip('orjson not installed')
+    monkeypatch.setattr(common, 'ORJSON', orjson)
+
+    pilot_db = {
+        "testpilot_2": {"ip": "192.168.0.1", "subjects": ["subject_3"]},
+        "testpilot_1": {"ip": "192.168.0.0", "subjects": ["subject_1", "subject_2"]}
+    }
+    pilot_db_fn = tmp_path / 'pilot_db.json'
+
+    save_pilotdb(pilot_db, pilot_db_fn)
+    # should be readable as plain json, preserving order
+    with open(pilot_db_fn, 'r') as pilot_file:
+        assert list(json.load(pilot_file).keys()) == list(pilot_db.keys())
+
+    loaded = load_pilotdb(pilot_db_fn)
+    assert loaded == pilot_db
+    assert list(loaded.keys()) == list(pilot_db.keys())
+
+    assert load_pilotdb(pilot_db_fn, reverse=True) == {
+        'subject_3': 'testpilot_2',
+        'subject_1': 'testpilot_1',
+        'subject_2': 'testpilot_1'
+    }
+
+
+def test_list_protocols(tmp_path):
+    (tmp_path / 'protocol_b.json').write_text('[]')
+    (tmp_path / 'protocol_a.json').write_text('[]')
+    (tmp_path / 'notes.txt').write_text('')
+    (tmp_path / 'subdir.json').mkdir()
+
+    assert list_protocols(tmp_path) == ['protocol_a', 'protocol_b']
+
+
+    (tmp_path / 'protocol_a.json').unlink()
+    (tmp_path / 'protocol_c.json').write_text('[]')
+    assert list_protocols(tmp_path) == ['protocol_b', 'protocol_c']
+
+
+def test_json_dumps_matches_stdlib(monkeypatch):
+    if not common.ORJSON:
+        pytest.skip('orjson not installed')
+
+    obj = {'pilot': {'ip': '192.168.0.1', 'subjects': ['subject_1', 'süb']}, 'empty': []}
+    fast = common.json_dumps(obj)
+    monkeypatch.setattr(common, 'ORJSON', False)
+    assert common.json_dumps(obj) == fast